@@ -1,38 +1,152 @@
 import os
 import uuid
-import zipfile
-import json
 import time
-import base64
+import zipfile
+import orjson
 import threading
-from flask import Flask, render_template, request, send_file, jsonify, Response, stream_with_context
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from flask import Flask, render_template, request, send_file, jsonify, Response, stream_with_context, after_this_request
+from werkzeug.exceptions import HTTPException
 from utils.data_loader import load_data
 from utils.placeholder_extractor import extract_placeholders
-from utils.certificate_generator import generate_certificate
-from utils.database import init_db, store_certificate, get_certificate
+from utils.certificate_generator import render_certificate
+from utils.database import init_db, store_certificates_bulk, get_certificate
 from utils.crypto_utils import generate_certificate_id, sign_certificate, compute_certificate_hash, verify_signature
 
 app = Flask(__name__)
-
-SECRET_KEY = os.environ.get('CERT_SECRET_KEY', 'udemy-123')
-BASE_URL    = os.environ.get('BASE_URL', 'https://certifyfast.onrender.com')
+# Reject oversized uploads before any of the body is read
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 50)) * 1024 * 1024
+
+SECRET_KEY   = os.environ.get('CERT_SECRET_KEY', 'udemy-123')
+BASE_URL     = os.environ.get('BASE_URL', 'https://certifyfast.onrender.com')
+try:
+    _CPUS = len(os.sched_getaffinity(0))   # honours CPU pinning, unlike cpu_count()
+except AttributeError:
+    _CPUS = os.cpu_count() or 1
+# Each render worker costs ~60 MB RSS; keep the default small for 512 MB hosts
+GEN_WORKERS  = int(os.environ.get('CERT_WORKERS', min(_CPUS, 2)))
+DB_BATCH     = 50        # certificates per INSERT transaction (their PDFs wait in memory)
+UPLOAD_CHUNK = 1 << 20   # copy uploads to disk in 1 MiB chunks
 
 BASE_DIR   = "/tmp/certifyfast"
 UPLOADS    = os.path.join(BASE_DIR, "uploads")
-OUTPUT     = os.path.join(BASE_DIR, "output")
 SIGNATURES = os.path.join(BASE_DIR, "signatures")
 ZIPS       = os.path.join(BASE_DIR, "zips")
 os.makedirs(UPLOADS,    exist_ok=True)
-os.makedirs(OUTPUT,     exist_ok=True)
 os.makedirs(SIGNATURES, exist_ok=True)
 os.makedirs(ZIPS,       exist_ok=True)
 
 init_db()
 
-# In-memory job store  { job_id: { status, progress, total, success, errors, zip_path, error_msg } }
+# In-memory job store  { job_id: { status, progress, total, success, errors, zip_path, error_msg, seq, cond } }
+# Each job's "cond" shares _jobs_lock; "seq" is bumped on every change so SSE
+# streams can sleep until something new happens.
 _jobs = {}
 _jobs_lock = threading.Lock()
 
+# Upload paths per analyzed session  { sid: (tmpl_path, data_path, sig_path, created_at) }
+_sessions = {}
+_sessions_lock = threading.Lock()
+SESSION_TTL = 60 * 60   # analyzed uploads never sent to /api/generate are dropped after this
+
+SSE_HEARTBEAT = 30        # seconds between keep-alive comments on an idle stream
+JOB_TTL       = 30 * 60   # finished jobs (and their ZIPs) are dropped after this
+
+# One render pool shared by all jobs, so concurrent jobs queue for the same
+# GEN_WORKERS processes instead of each spawning their own.
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _get_render_pool():
+    """Return the shared render pool, starting it on first use."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # PyMuPDF is not thread-safe, so rows are rendered in processes.
+            # "spawn" avoids forking a process that already runs server threads.
+            _render_pool = ProcessPoolExecutor(max_workers=GEN_WORKERS,
+                                               mp_context=multiprocessing.get_context("spawn"))
+        return _render_pool
+
+
+def _discard_render_pool(pool):
+    """Drop a broken pool (a worker died) so the next job starts a fresh one."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _update_job(job_id, **fields):
+    """Apply fields to a job and wake any SSE streams watching it."""
+    with _jobs_lock:
+        job = _jobs[job_id]
+        job.update(fields)
+        if job["status"] in ("done", "error"):
+            job.setdefault("finished_at", time.time())
+        job["seq"] += 1
+        job["cond"].notify_all()
+
+
+def _sweep_jobs():
+    """Forget finished jobs older than JOB_TTL and delete ZIPs nobody downloaded."""
+    cutoff = time.time() - JOB_TTL
+    with _jobs_lock:
+        stale   = [jid for jid, job in _jobs.items() if job.get("finished_at", cutoff) < cutoff]
+        expired = [_jobs.pop(jid) for jid in stale]
+    for job in expired:
+        if job.get("zip_path"):
+            try: os.remove(job["zip_path"])
+            except OSError: pass
+
+
+def _sweep_sessions():
+    """Forget sessions older than SESSION_TTL and delete their uploaded files."""
+    cutoff = time.time() - SESSION_TTL
+    with _sessions_lock:
+        stale   = [sid for sid, sess in _sessions.items() if sess[3] < cutoff]
+        expired = [_sessions.pop(sid) for sid in stale]
+    for tmpl_path, data_path, sig_path, _ in expired:
+        for p in (tmpl_path, data_path, sig_path):
+            if p:
+                try: os.remove(p)
+                except OSError: pass
+
+
+def _sse(event_type, **fields):
+    """Encode one SSE data event as bytes."""
+    return b"data: " + orjson.dumps({"type": event_type, **fields}) + b"\n\n"
+
+
+NAME_COLUMNS   = {'name', 'student', 'recipient', 'full_name'}
+COURSE_COLUMNS = {'course', 'subject', 'program', 'course_name'}
+DATE_COLUMNS   = {'date', 'issue_date', 'completion_date', 'cert_date'}
+
+
+def _detect_role_columns(columns):
+    """
+    Pick the data columns that hold the recipient name, course and date.
+
+    Falls back to the 1st / 2nd / 3rd column when no header matches.
+    Returns (name_col, course_col, date_col); any of them may be None.
+    """
+    name_col = course_col = date_col = None
+    for col in columns:
+        cl = col.lower().strip()
+        if cl in NAME_COLUMNS:     name_col   = col
+        elif cl in COURSE_COLUMNS: course_col = col
+        elif cl in DATE_COLUMNS:   date_col   = col
+
+    if name_col   is None and len(columns) > 0: name_col   = columns[0]
+    if course_col is None and len(columns) > 1: course_col = columns[1]
+    if date_col   is None and len(columns) > 2: date_col   = columns[2]
+    return name_col, course_col, date_col
+
 
 def _compute_mapping(df_columns, placeholder_keys):
     col_map = {col.strip().lower(): col for col in df_columns}
@@ -45,6 +159,12 @@ def _compute_mapping(df_columns, placeholder_keys):
     return matched, unmatched
 
 
+@app.errorhandler(413)
+def too_large(_):
+    limit_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({"error": f"Upload too large. The limit is {limit_mb} MB."}), 413
+
+
 # ─────────────────────────────────────────────────────────────
 @app.route("/")
 def index():
@@ -78,6 +198,7 @@ def verify_api(cert_id):
 
 @app.route("/api/analyze", methods=["POST"])
 def analyze():
+    saved, registered = [], False   # uploads are deleted unless a session owns them
     try:
         template_file  = request.files.get("template")
         data_file      = request.files.get("data")
@@ -92,14 +213,16 @@ def analyze():
         tmpl_path = os.path.join(UPLOADS, f"{sid}_template{tmpl_ext}")
         data_path = os.path.join(UPLOADS, f"{sid}_data{data_ext}")
 
-        template_file.save(tmpl_path)
-        data_file.save(data_path)
+        saved += [tmpl_path, data_path]
+        template_file.save(tmpl_path, buffer_size=UPLOAD_CHUNK)
+        data_file.save(data_path, buffer_size=UPLOAD_CHUNK)
 
         sig_path = None
         if signature_file and signature_file.filename:
             sig_ext  = os.path.splitext(signature_file.filename)[1] or ".png"
             sig_path = os.path.join(SIGNATURES, f"{sid}_signature{sig_ext}")
-            signature_file.save(sig_path)
+            saved.append(sig_path)
+            signature_file.save(sig_path, buffer_size=UPLOAD_CHUNK)
 
         placeholders = extract_placeholders(tmpl_path)
         df           = load_data(data_path)
@@ -109,9 +232,12 @@ def analyze():
 
         matched, unmatched = _compute_mapping(df.columns.tolist(), list(placeholders.keys()))
 
-        preview = []
-        for _, row in df.head(5).iterrows():
-            preview.append({col: str(row[col]) for col in df.columns})
+        _sweep_sessions()
+        with _sessions_lock:
+            _sessions[sid] = (tmpl_path, data_path, sig_path, time.time())
+        registered = True
+
+        preview = df.head(5).fillna("").to_dict("records")
 
         return jsonify({
             "session_id":    sid,
@@ -126,9 +252,17 @@ def analyze():
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
+    except HTTPException:
+        raise   # e.g. 413 from request.files → handled by too_large()
     except Exception as e:
         import traceback; traceback.print_exc()
         return jsonify({"error": str(e)}), 500
+    finally:
+        if not registered:
+            for p in saved:
+                if os.path.exists(p):
+                    try: os.remove(p)
+                    except OSError: pass
 
 
 # ─────────────────────────────────────────────────────────────
@@ -139,13 +273,7 @@ def _run_generation(job_id, tmpl_path, data_path, sig_path,
     import pandas as pd
 
     def update(status, **kw):
-        with _jobs_lock:
-            _jobs[job_id].update({"status": status, **kw})
-
-    def safe_str(val):
-        if isinstance(val, pd.Timestamp):
-            return val.strftime('%Y-%m-%d')
-        return str(val).strip()
+        _update_job(job_id, status=status, **kw)
 
     try:
         placeholders = extract_placeholders(tmpl_path)
@@ -163,70 +291,107 @@ def _run_generation(job_id, tmpl_path, data_path, sig_path,
 
     zip_path = os.path.join(ZIPS, f"{job_id}.zip")
     errors, success_count = [], 0
+    pool, pending = None, {}
 
     try:
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for idx, (_, row) in enumerate(df.iterrows()):
-                out_pdf = None
+        # load_data returns stripped STRING_DTYPE columns; blank cells → ""
+        # once here, column-wise, and the generator skips empty values.
+        cols   = df.columns.tolist()
+        str_df = df.fillna("")
+
+        name_col, course_col, date_col = _detect_role_columns(cols)
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        # ZIP entry names from the first column, sanitised in one regex pass.
+        # Arrow strings run the pattern in RE2, where \w is ASCII-only, so
+        # letters and digits use Unicode classes (same set as str.isalnum).
+        # \pL / \pN are RE2 syntax, which is why load_data uses STRING_DTYPE.
+        safe_names = str_df.iloc[:, 0].str.replace(r"[^\pL\pN _\-]", "_", regex=True).str.strip()
+        fallbacks  = pd.Series([f"certificate_{i+1}" for i in range(total)], index=str_df.index)
+        safe_names = safe_names.mask(safe_names.eq("") | safe_names.str.lower().eq("nan"), fallbacks)
+
+        # Rows render in the shared pool; the DB insert and ZIP write stay on this thread.
+        pool = _get_render_pool()
+        # PDFs are already Flate-compressed internally; deflating them again
+        # burns CPU for almost no size gain, so entries are stored as-is.
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+            batch = []   # (idx, pdf_bytes, db_row) awaiting their INSERT
+            # Plain tuples (name=None) avoid iterrows' per-row Series boxing
+            # and keep column names that aren't valid identifiers intact.
+            for idx, row in enumerate(str_df.itertuples(index=False, name=None)):
+                raw_data = dict(zip(cols, row))
+                cert_id  = generate_certificate_id()
+                cert_data = {
+                    'cert_id': cert_id,
+                    'name':    raw_data[name_col]   if name_col   else 'Unknown',
+                    'course':  raw_data[course_col] if course_col else 'Unknown',
+                    'date':    raw_data[date_col]   if date_col   else today,
+                }
+                verification_url = f"{BASE_URL}/verify/{cert_id}"
+
+                fut = pool.submit(
+                    render_certificate,
+                    tmpl_path, raw_data, placeholders,
+                    cert_id=cert_id, verification_url=verification_url,
+                    qr_position=qr_position,
+                    signature_path=sig_path, sig_position=sig_position,
+                )
+                pending[fut] = (idx, raw_data, cert_data)
+
+            for done_count, fut in enumerate(as_completed(pending), start=1):
+                idx, raw_data, cert_data = pending.pop(fut)
                 try:
-                    raw_data  = {col: safe_str(row[col]) for col in df.columns}
-                    fname_val = safe_str(row[df.columns[0]])
-                    if not fname_val or fname_val.lower() == "nan":
-                        fname_val = f"certificate_{idx+1}"
-                    safe_name = "".join(c if c.isalnum() or c in " _-" else "_" for c in fname_val).strip() or f"certificate_{idx+1}"
-                    out_pdf   = os.path.join(OUTPUT, f"{job_id}_{idx}.pdf")
-
-                    cert_id  = generate_certificate_id()
-                    cert_data = {'cert_id': cert_id}
-                    for col in df.columns:
-                        cl = col.lower().strip()
-                        if cl in ['name', 'student', 'recipient', 'full_name']:
-                            cert_data['name']   = safe_str(row[col])
-                        elif cl in ['course', 'subject', 'program', 'course_name']:
-                            cert_data['course'] = safe_str(row[col])
-                        elif cl in ['date', 'issue_date', 'completion_date', 'cert_date']:
-                            cert_data['date']   = safe_str(row[col])
-
-                    if 'name'   not in cert_data: cert_data['name']   = safe_str(row[df.columns[0]]) if len(df.columns) > 0 else 'Unknown'
-                    if 'course' not in cert_data: cert_data['course'] = safe_str(row[df.columns[1]]) if len(df.columns) > 1 else 'Unknown'
-                    if 'date'   not in cert_data:
-                        from datetime import datetime
-                        cert_data['date'] = safe_str(row[df.columns[2]]) if len(df.columns) > 2 else datetime.now().strftime('%Y-%m-%d')
+                    pdf_bytes = fut.result()
 
                     signature  = sign_certificate(cert_data, SECRET_KEY)
                     data_hash  = compute_certificate_hash(cert_data)
-                    verification_url = f"{BASE_URL}/verify/{cert_id}"
-
-                    generate_certificate(
-                        tmpl_path, out_pdf, raw_data, placeholders,
-                        cert_id=cert_id, verification_url=verification_url,
-                        qr_position=qr_position,
-                        signature_path=sig_path, sig_position=sig_position,
-                    )
-                    store_certificate(cert_id, cert_data['name'], cert_data['course'],
-                                      cert_data['date'], signature, data_hash, additional_data=raw_data)
-
-                    if os.path.exists(out_pdf) and os.path.getsize(out_pdf) > 0:
-                        zf.write(out_pdf, arcname=f"{safe_name}.pdf")
+
+                    if pdf_bytes:
+                        batch.append((idx, pdf_bytes,
+                                      (cert_data['cert_id'], cert_data['name'], cert_data['course'],
+                                       cert_data['date'], signature, data_hash, raw_data)))
+                        # Counted once rendered so progress stays per-row;
+                        # taken back below if its record can't be saved.
                         success_count += 1
                     else:
                         errors.append(f"Row {idx+1}: PDF not created")
 
+                except BrokenProcessPool:
+                    raise
                 except Exception as e:
                     errors.append(f"Row {idx+1}: {str(e)[:150]}")
-                finally:
-                    if out_pdf and os.path.exists(out_pdf):
-                        try: os.remove(out_pdf)
-                        except: pass
+
+                # Batched so SQLite commits once per DB_BATCH certificates;
+                # the final partial batch is flushed before the job is done.
+                # A PDF only goes into the ZIP once its record is stored, so
+                # every downloaded certificate verifies.
+                if len(batch) >= DB_BATCH or (done_count == total and batch):
+                    try:
+                        failed = store_certificates_bulk([db_row for _, _, db_row in batch])
+                    except Exception as e:
+                        failed = {i: str(e) for i in range(len(batch))}
+                    for i, (b_idx, b_pdf, _) in enumerate(batch):
+                        if i in failed:
+                            errors.append(f"Row {b_idx+1}: could not save certificate: {failed[i][:120]}")
+                            success_count -= 1
+                        else:
+                            zf.writestr(f"{safe_names.iat[b_idx]}.pdf", b_pdf)
+                    batch = []
 
                 # Update progress after each cert
-                with _jobs_lock:
-                    _jobs[job_id].update(done=idx+1, success=success_count, errors=errors)
+                _update_job(job_id, done=done_count, success=success_count, errors=errors)
 
+    except BrokenProcessPool:
+        _discard_render_pool(pool)
+        failed_msg = "Generation failed: a render worker crashed. Please try again."
     except Exception as e:
-        update("error", error_msg=f"Fatal ZIP error: {e}")
-        return
+        failed_msg = f"Generation failed: {e}"
+    else:
+        failed_msg = None
     finally:
+        # Don't leave this job's queued rows occupying the shared pool
+        for fut in pending:
+            fut.cancel()
         for p in [tmpl_path, data_path]:
             if p and os.path.exists(p):
                 try: os.remove(p)
@@ -235,6 +400,14 @@ def _run_generation(job_id, tmpl_path, data_path, sig_path,
             try: os.remove(sig_path)
             except: pass
 
+    if failed_msg:
+        # The errored job is popped by job_status, so nothing would sweep a partial ZIP
+        if os.path.exists(zip_path):
+            try: os.remove(zip_path)
+            except: pass
+        update("error", error_msg=failed_msg)
+        return
+
     if success_count == 0:
         msg = "Failed to generate any certificates."
         if errors: msg += " First error: " + errors[0]
@@ -259,24 +432,23 @@ def generate():
     if not sid:
         return jsonify({"error": "Session expired. Please re-upload your files."}), 400
 
-    # Find files
-    tmpl_path = data_path = sig_path = None
-    try:
-        for f in os.listdir(UPLOADS):
-            if f.startswith(f"{sid}_template"):   tmpl_path = os.path.join(UPLOADS, f)
-            elif f.startswith(f"{sid}_data"):     data_path = os.path.join(UPLOADS, f)
-        for f in os.listdir(SIGNATURES):
-            if f.startswith(f"{sid}_signature"):  sig_path = os.path.join(SIGNATURES, f); break
-    except Exception as e:
-        return jsonify({"error": f"Could not find session files: {e}"}), 500
+    # The job consumes (and deletes) the uploads, so a session is single-use
+    with _sessions_lock:
+        session = _sessions.pop(sid, None)
+    if session is None:
+        return jsonify({"error": "Session expired. Please re-upload your files."}), 400
+    tmpl_path, data_path, sig_path, _ = session
 
-    if not tmpl_path or not data_path:
+    if not os.path.exists(tmpl_path) or not os.path.exists(data_path):
         return jsonify({"error": "Session expired. Please re-upload your files."}), 400
 
+    _sweep_jobs()
+
     job_id = uuid.uuid4().hex[:12]
     with _jobs_lock:
         _jobs[job_id] = {"status": "queued", "done": 0, "total": 0,
-                         "success": 0, "errors": [], "zip_path": None, "error_msg": None}
+                         "success": 0, "errors": [], "zip_path": None, "error_msg": None,
+                         "seq": 0, "cond": threading.Condition(_jobs_lock)}
 
     t = threading.Thread(target=_run_generation,
                          args=(job_id, tmpl_path, data_path, sig_path, qr_position, sig_position),
@@ -292,58 +464,50 @@ def generate():
 @app.route("/api/job/<job_id>")
 def job_status(job_id):
     def stream():
+        seen = -1
         while True:
             with _jobs_lock:
                 job = _jobs.get(job_id)
+                if job is not None and job["seq"] == seen:
+                    job["cond"].wait(timeout=SSE_HEARTBEAT)
+                    job = _jobs.get(job_id)
+                if job is not None:
+                    # Snapshot under the lock; the worker keeps mutating the dict
+                    job = dict(job, errors=list(job["errors"]))
 
             if job is None:
-                data = json.dumps({"type": "error", "message": "Job not found."})
-                yield f"data: {data}\n\n"
+                yield _sse("error", message="Job not found.")
                 return
 
+            if job["seq"] == seen:
+                yield b": ping\n\n"   # idle heartbeat keeps proxies from closing the stream
+                continue
+            seen   = job["seq"]
             status = job["status"]
 
             if status == "error":
-                data = json.dumps({"type": "error", "message": job.get("error_msg", "Unknown error")})
-                yield f"data: {data}\n\n"
+                yield _sse("error", message=job.get("error_msg", "Unknown error"))
                 with _jobs_lock:
                     _jobs.pop(job_id, None)
                 return
 
             elif status == "done":
-                zip_path = job.get("zip_path")
-                try:
-                    with open(zip_path, "rb") as f:
-                        zip_b64 = base64.b64encode(f.read()).decode("utf-8")
-                    os.remove(zip_path)
-                except Exception as e:
-                    data = json.dumps({"type": "error", "message": f"Could not read ZIP: {e}"})
-                    yield f"data: {data}\n\n"
-                    return
-                data = json.dumps({
-                    "type":    "done",
-                    "success": job["success"],
-                    "total":   job["total"],
-                    "errors":  job["errors"][:5],
-                    "zip_b64": zip_b64,
-                })
-                yield f"data: {data}\n\n"
-                with _jobs_lock:
-                    _jobs.pop(job_id, None)
+                # The job stays registered until the ZIP is downloaded or JOB_TTL passes
+                yield _sse("done",
+                           success=job["success"],
+                           total=job["total"],
+                           errors=job["errors"][:5],
+                           download_url=f"/api/download/{job_id}")
                 return
 
             else:
                 # queued or running — send progress ping
-                data = json.dumps({
-                    "type":    "progress",
-                    "status":  status,
-                    "done":    job["done"],
-                    "total":   job["total"],
-                    "success": job["success"],
-                    "errors":  len(job["errors"]),
-                })
-                yield f"data: {data}\n\n"
-                time.sleep(0.8)
+                yield _sse("progress",
+                           status=status,
+                           done=job["done"],
+                           total=job["total"],
+                           success=job["success"],
+                           errors=len(job["errors"]))
 
     return Response(
         stream_with_context(stream()),
@@ -352,5 +516,37 @@ def job_status(job_id):
     )
 
 
+# ─────────────────────────────────────────────────────────────
+# GET /api/download/<job_id>  →  finished ZIP, deleted once fully sent
+# ─────────────────────────────────────────────────────────────
+@app.route("/api/download/<job_id>")
+def download(job_id):
+    _sweep_jobs()
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        zip_path = job.get("zip_path") if job and job["status"] == "done" else None
+
+    if not zip_path or not os.path.exists(zip_path):
+        return jsonify({"error": "Download not found or already retrieved."}), 404
+
+    @after_this_request
+    def _cleanup(response):
+        # Only a complete GET consumes the ZIP; HEAD, Range (206) and 304
+        # responses leave it for the real download.
+        if request.method != "GET" or response.status_code != 200:
+            return response
+        # send_file already holds the file open, so unlinking is safe here
+        with _jobs_lock:
+            _jobs.pop(job_id, None)
+        try: os.remove(zip_path)
+        except OSError: pass
+        return response
+
+    return send_file(zip_path, mimetype="application/zip", as_attachment=True,
+                     download_name=f"certificates_{job_id}.zip", conditional=True)
+
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5001, debug=True, threaded=True)
+    # Debugger/reloader only on request (FLASK_DEBUG=1); production uses gunicorn.conf.py
+    debug = os.environ.get("FLASK_DEBUG") == "1"
+    app.run(host="0.0.0.0", port=5001, debug=debug, threaded=True, use_reloader=False)
@@ -1,9 +1,14 @@
 import os
 
 bind             = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
-workers          = 1       # single worker so in-memory _jobs dict is shared
-threads          = 8       # handle concurrent SSE polls + POST requests
-timeout          = 120     # individual request timeout (SSE polls are short)
+# Single worker so the in-memory _jobs dict (and its SSE wakeups) is shared.
+# CPU-bound PDF rendering already fans out to a shared process pool
+# (CERT_WORKERS, default usable CPUs capped at 2), so extra web workers
+# wouldn't add throughput.
+workers          = 1
+# Open SSE streams each hold a thread while they wait for job updates
+threads          = max(8, (os.cpu_count() or 1) * 2)
+timeout          = 120     # worker heartbeat; gthread keeps long SSE streams alive
 graceful_timeout = 30
 worker_class     = "gthread"
 keepalive        = 5
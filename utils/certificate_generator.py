@@ -1,4 +1,6 @@
 import fitz
+from io import BytesIO
+from functools import lru_cache
 from utils.qr_generator import generate_qr_code, qr_to_bytes
 
 
@@ -83,6 +85,8 @@ def generate_certificate(template_path, output_path, row_data, placeholders, cer
     """
     Generate one certificate with QR code and signature for verification.
 
+    template_path:     Path to the PDF template, or the template's raw bytes
+    output_path:       File path or writable file-like object for the PDF
     row_data:          { "Vegetable": "Carrot", "Fruit": "Apple", ... }
     placeholders:      { "vegetable": { rect, font_size, font_name, color … }, … }
     cert_id:           Unique certificate ID (optional)
@@ -93,7 +97,10 @@ def generate_certificate(template_path, output_path, row_data, placeholders, cer
     """
     doc = None
     try:
-        doc = fitz.open(template_path)
+        if isinstance(template_path, (bytes, bytearray)):
+            doc = fitz.open(stream=template_path, filetype="pdf")
+        else:
+            doc = fitz.open(template_path)
         page = doc[0]
         page_width = page.rect.width
         page_height = page.rect.height
@@ -272,3 +279,27 @@ def generate_certificate(template_path, output_path, row_data, placeholders, cer
     finally:
         if doc:
             doc.close()
+
+
+@lru_cache(maxsize=1)
+def _read_template(template_path):
+    """
+    Template bytes, read once per worker process and job.  Upload paths are
+    unique per session, so a path never maps to different content.  Only the
+    latest template is kept: workers are long-lived and a template can be up
+    to MAX_UPLOAD_MB, so finished jobs must not pin their bytes.
+    """
+    with open(template_path, "rb") as f:
+        return f.read()
+
+
+def render_certificate(template_path, row_data, placeholders, **kwargs):
+    """
+    Generate one certificate in memory and return the PDF bytes.
+
+    Top-level so it can be run in a worker process; takes the same
+    keyword arguments as generate_certificate().
+    """
+    buf = BytesIO()
+    generate_certificate(_read_template(template_path), buf, row_data, placeholders, **kwargs)
+    return buf.getvalue()
@@ -1,6 +1,10 @@
 import pandas as pd
 import os
 
+# Arrow-backed strings: cells live in one contiguous buffer and the .str
+# methods run in Arrow compute instead of per-object Python calls.
+STRING_DTYPE = "string[pyarrow]"
+
 
 def load_data(path: str) -> pd.DataFrame:
     """
@@ -12,6 +16,8 @@ def load_data(path: str) -> pd.DataFrame:
       - Whitespace in column names and string cell values
       - Empty rows (drops them)
 
+    Every column is read as STRING_DTYPE; missing cells stay <NA>.
+
     Raises ValueError with a clear message on failure.
     """
     ext = os.path.splitext(path)[1].lower()
@@ -21,7 +27,7 @@ def load_data(path: str) -> pd.DataFrame:
     if ext == ".csv":
         # Try CSV first; if it fails or produces garbage, try Excel
         try:
-            df = pd.read_csv(path, engine="python", dtype=str)
+            df = pd.read_csv(path, engine="python", dtype=STRING_DTYPE)
             # Sanity check: if we got only 1 column and it looks like binary,
             # it's probably actually an xlsx file
             if len(df.columns) == 1 and df.columns[0].startswith("PK"):
@@ -29,7 +35,7 @@ def load_data(path: str) -> pd.DataFrame:
         except Exception:
             # Fallback: try reading as Excel
             try:
-                df = pd.read_excel(path, engine="openpyxl", dtype=str)
+                df = pd.read_excel(path, engine="openpyxl", dtype=STRING_DTYPE)
             except Exception as e:
                 raise ValueError(
                     f"Could not read '{os.path.basename(path)}'. "
@@ -37,7 +43,7 @@ def load_data(path: str) -> pd.DataFrame:
                 )
     elif ext in (".xlsx", ".xls"):
         try:
-            df = pd.read_excel(path, engine="openpyxl", dtype=str)
+            df = pd.read_excel(path, engine="openpyxl", dtype=STRING_DTYPE)
         except Exception as e:
             raise ValueError(
                 f"Could not read '{os.path.basename(path)}' as Excel. ({e})"
@@ -51,9 +57,9 @@ def load_data(path: str) -> pd.DataFrame:
     # Strip whitespace from column names
     df.columns = [str(c).strip() for c in df.columns]
 
-    # Strip whitespace from all string columns
-    for col in df.select_dtypes(include=["object"]).columns:
-        df[col] = df[col].astype(str).str.strip()
+    # Strip whitespace from all string columns (NA cells are left as NA)
+    for col in df.columns:
+        df[col] = df[col].astype(STRING_DTYPE).str.strip()
 
     # Drop completely empty rows
     df.dropna(how="all", inplace=True)
@@ -18,6 +18,9 @@ def init_db():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # WAL lets /verify reads proceed while a batch is being written
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS certificates (
             cert_id TEXT PRIMARY KEY,
@@ -35,27 +38,52 @@ def init_db():
     conn.close()
 
 
-def store_certificate(cert_id, name, course, date, signature, data_hash, additional_data=None):
-    """Store a certificate in the database."""
+_INSERT_SQL = """
+    INSERT INTO certificates (cert_id, recipient_name, course_name, issue_date, signature, data_hash, additional_data, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def store_certificates_bulk(rows):
+    """
+    Store many certificates in a single transaction.
+
+    rows: list of (cert_id, name, course, date, signature, data_hash, additional_data)
+
+    If the batch insert fails, each row is retried on its own so one bad row
+    doesn't sink the rest.  Returns { row_index: error message } for the rows
+    that could not be stored (empty when all succeeded).
+    """
+    now = datetime.now().isoformat()
+    params = [
+        (cert_id, name, course, date, signature, data_hash,
+         json.dumps(additional_data) if additional_data else None, now)
+        for cert_id, name, course, date, signature, data_hash, additional_data in rows
+    ]
+    if not params:
+        return {}
+
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO certificates (cert_id, recipient_name, course_name, issue_date, signature, data_hash, additional_data, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        cert_id,
-        name,
-        course,
-        date,
-        signature,
-        data_hash,
-        json.dumps(additional_data) if additional_data else None,
-        datetime.now().isoformat()
-    ))
-    
-    conn.commit()
-    conn.close()
+    try:
+        # One fsync per batch is enough under WAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                conn.executemany(_INSERT_SQL, params)
+            return {}
+        except sqlite3.Error:
+            pass   # rolled back; find the offending rows one at a time
+
+        failed = {}
+        for i, p in enumerate(params):
+            try:
+                with conn:
+                    conn.execute(_INSERT_SQL, p)
+            except sqlite3.Error as e:
+                failed[i] = str(e)
+        return failed
+    finally:
+        conn.close()
 
 
 def get_certificate(cert_id):
@@ -1,5 +1,7 @@
 import fitz
+import os
 import re
+from functools import lru_cache
 
 PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
 
@@ -27,7 +29,17 @@ def extract_placeholders(pdf_path):
             },
             ...
         }
+
+    Results are cached per (path, mtime, size), so the analyze step and the
+    generation job that follows parse the template only once.  Treat the
+    returned dict as read-only.
     """
+    st = os.stat(pdf_path)
+    return _extract_placeholders_cached(pdf_path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _extract_placeholders_cached(pdf_path, mtime_ns, size):
     doc = fitz.open(pdf_path)
     placeholders = {}
 